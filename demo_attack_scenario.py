@@ -6,41 +6,107 @@ Executes predefined attack scenarios to show AI coordination capabilities
 
 import argparse
 import json
+import re
 import yaml
 import sys
 import os
 import time
+from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
+# Use the libyaml-backed C loader when available (order-of-magnitude faster
+# than the pure-Python loader on the same API)
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# orjson is an optional accelerator (~5x faster than stdlib json for
+# serializing large campaign results); fall back to stdlib when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def fast_json_loads(data):
+    """Decode JSON response bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def fast_json_dumps(obj):
+    """Serialize obj to an indented JSON string, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+def dump_json_result(path, obj):
+    """Write obj to path as indented JSON, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
 def load_scenario_config(config_path):
     """Load attack scenario configuration"""
+    # Read the whole file once so the loader works on a plain string
+    # instead of going through PyYAML's line-by-line IO wrapper
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f.read(), Loader=YamlLoader)
 
-def wait_for_mcp_server(base_url="http://localhost:5000", timeout=60):
+def create_http_session():
+    """Create a shared HTTP session with keep-alive connection pooling"""
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(
+        pool_connections=4, pool_maxsize=16,
+        max_retries=Retry(total=5, backoff_factor=1.0,
+                          status_forcelist=[429, 502, 503, 504],
+                          allowed_methods=['GET', 'POST'],
+                          respect_retry_after_header=True)
+    ))
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+def wait_for_mcp_server(base_url="http://localhost:5000", timeout=60, session=None):
     """Wait for MCP server to be ready"""
     print("Waiting for MCP server to be ready...")
+    session = session or create_http_session()
     start_time = time.time()
-    
+
+    # Exponential backoff: probe quickly right after launch (100 ms), back
+    # off towards 2 s while the server is still coming up
+    delay = 0.1
     while time.time() - start_time < timeout:
         try:
-            response = requests.get(f"{base_url}/api/status", timeout=5)
+            response = session.get(f"{base_url}/api/status", timeout=5)
             if response.status_code == 200:
                 print("✓ MCP server is ready")
                 return True
         except:
             pass
-        time.sleep(2)
-    
+        time.sleep(delay)
+        delay = min(delay * 1.5, 2.0)
+
     print("✗ MCP server failed to start")
     return False
 
-def execute_scenario(config, base_url="http://localhost:5000"):
+def execute_scenario(config, base_url="http://localhost:5000", session=None):
     """Execute the attack scenario"""
+    session = session or create_http_session()
     scenario = config['scenario']
     attack_config = config['attack']
     ai_config = config['ai']
+
+    # Pre-compute the sanitized results path once, outside the
+    # post-response hot path
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    safe_name = re.sub(r'[^A-Za-z0-9]+', '_', scenario['name'])
+    results_path = Path('demo_results') / f"scenario_{safe_name}_{timestamp}.json"
     
     print(f"\n{'='*60}")
     print(f"Executing: {scenario['name']}")
@@ -78,29 +144,35 @@ def execute_scenario(config, base_url="http://localhost:5000"):
     
     try:
         # Start the attack campaign
-        response = requests.post(
+        response = session.post(
             f"{base_url}/api/ai/execute",
             json=campaign_data,
             timeout=scenario['duration'] + 30
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = fast_json_loads(response.content)
             
             # Display attack sequence
             if 'attacks_executed' in result:
-                print(f"\nTotal Attacks Executed: {len(result['attacks_executed'])}")
-                print("\nAttack Sequence:")
+                # Accumulate the entire display section into one buffer and
+                # write it with a single stdout call: line-buffered print
+                # takes the stdout lock and flushes per line, which adds up
+                # over campaigns with hundreds of attacks
+                buf = [f"\nTotal Attacks Executed: {len(result['attacks_executed'])}\n",
+                       "\nAttack Sequence:\n"]
                 for i, attack in enumerate(result['attacks_executed'], 1):
-                    print(f"\n  [{i}] {attack['technique'].upper()}")
-                    print(f"      Time: {attack.get('timestamp', 'N/A')}")
+                    buf.append(f"\n  [{i}] {attack['technique'].upper()}\n")
+                    buf.append(f"      Time: {attack.get('timestamp', 'N/A')}\n")
                     if 'params' in attack:
-                        print(f"      Parameters: {json.dumps(attack['params'], indent=8)}")
+                        buf.append(f"      Parameters: {fast_json_dumps(attack['params'])}\n")
                     if 'impact' in attack:
                         impact = attack['impact']
-                        print(f"      Impact Score: {impact.get('total_impact', 0):.2f}")
+                        buf.append(f"      Impact Score: {impact.get('total_impact', 0):.2f}\n")
                     if 'ai_reasoning' in attack:
-                        print(f"      AI Reasoning: {attack['ai_reasoning'][:100]}...")
+                        buf.append(f"      AI Reasoning: {attack['ai_reasoning'][:100]}...\n")
+                sys.stdout.write(''.join(buf))
+                sys.stdout.flush()
             
             # Display metrics
             if 'metrics' in result:
@@ -115,18 +187,14 @@ def execute_scenario(config, base_url="http://localhost:5000"):
                 print(f"Campaign Duration: {metrics.get('duration', 0):.1f}s")
             
             # Save detailed results
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            results_file = f"demo_results/scenario_{scenario['name'].replace(' ', '_')}_{timestamp}.json"
-            
-            with open(results_file, 'w') as f:
-                json.dump({
-                    'scenario': scenario,
-                    'config': config,
-                    'result': result,
-                    'timestamp': timestamp
-                }, f, indent=2)
-            
-            print(f"\n✓ Results saved to: {results_file}")
+            dump_json_result(results_path, {
+                'scenario': scenario,
+                'config': config,
+                'result': result,
+                'timestamp': timestamp
+            })
+
+            print(f"\n✓ Results saved to: {results_path}")
             
         else:
             print(f"✗ Attack campaign failed: {response.status_code}")
@@ -158,13 +226,16 @@ def main():
         print(f"Error loading scenario config: {e}")
         sys.exit(1)
     
+    # Shared HTTP session reused across the readiness poll and the campaign
+    session = create_http_session()
+
     # Wait for MCP server
-    if not wait_for_mcp_server(args.server_url, args.wait_timeout):
+    if not wait_for_mcp_server(args.server_url, args.wait_timeout, session=session):
         print("Failed to connect to MCP server. Is it running?")
         sys.exit(1)
-    
+
     # Execute the scenario
-    execute_scenario(config, args.server_url)
+    execute_scenario(config, args.server_url, session=session)
     
     print("\n✓ Scenario demonstration complete")
 
@@ -9,18 +9,105 @@ import sys
 import time
 import json
 import argparse
+import asyncio
+import queue
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 import signal
 import yaml
 
+# BaseLoader returns every scalar as a string, skipping the implicit-tag
+# resolver that SafeLoader runs on each value; the demo config's handful
+# of non-string fields are coerced explicitly after loading
+try:
+    from yaml import CBaseLoader as YamlBaseLoader
+except ImportError:
+    from yaml import BaseLoader as YamlBaseLoader
+
+def _coerce_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Known non-string fields in the demo config schema
+_CONFIG_FIELD_TYPES = {
+    ('demo', 'duration'): int,
+    ('demo', 'trials'): int,
+    ('ai', 'temperature'): float,
+    ('ai', 'max_tokens'): int,
+    ('ai', 'timeout'): int,
+    ('docker', 'startup_timeout'): int,
+    ('docker', 'cleanup_on_exit'): _coerce_bool,
+    ('grid', 'helics', 'time_delta'): float,
+    ('grid', 'helics', 'period'): float,
+}
+
+def _coerce_config_types(config):
+    """Apply the known schema types to a BaseLoader-parsed config"""
+    for path, cast in _CONFIG_FIELD_TYPES.items():
+        node = config
+        for key in path[:-1]:
+            node = node.get(key) if isinstance(node, dict) else None
+            if node is None:
+                break
+        else:
+            leaf = path[-1]
+            if isinstance(node, dict) and leaf in node:
+                try:
+                    node[leaf] = cast(node[leaf])
+                except (TypeError, ValueError):
+                    pass
+    return config
+
+# orjson is an optional accelerator (~5x faster than stdlib json for
+# serializing large campaign results); fall back to stdlib when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# simdjson's on-demand parser lets the comparison demo pull just the
+# metrics block out of a large response without materializing the
+# per-trial traces; optional, like orjson
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Refuse to buffer comparison responses beyond this size; a runaway
+# trials x duration combination should fail loudly instead of OOMing
+MAX_COMPARISON_RESPONSE_BYTES = 256 * 1024 * 1024
+
+def fast_json_loads(data):
+    """Decode JSON response bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def serialize_json_result(obj):
+    """Serialize obj to indented JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=2).encode()
+
+# Static paths derived from the script location, computed once at import
+DEMO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CONFIG_PATH = os.path.join(DEMO_DIR, 'config', 'demo_config.yaml')
+MCP_CONFIG_OVERRIDE_PATH = os.path.join(DEMO_DIR, 'mcp-server', 'config', 'mcp.override.json')
+API_KEY_PATH = os.path.join(DEMO_DIR, 'API.txt')
+
 class ContainerizedDemo:
     """Containerized demo launcher using Docker Compose"""
     
     def __init__(self, config_file=None):
-        self.demo_dir = os.path.dirname(os.path.abspath(__file__))
-        self.results_dir = os.path.join(self.demo_dir, 'demo_results')
+        self.demo_dir = DEMO_DIR
+        self.results_dir = os.path.join(DEMO_DIR, 'demo_results')
         
         # Load configuration
         self.config = self._load_config(config_file)
@@ -30,13 +117,54 @@ class ContainerizedDemo:
         results_dir = self.config.get('results', {}).get('directory', 'demo_results')
         self.results_dir = os.path.join(self.demo_dir, results_dir)
         os.makedirs(self.results_dir, exist_ok=True)
-        
+
+        # Shared HTTP session with keep-alive pooling so the status polls and
+        # campaign POSTs reuse one TCP connection instead of reconnecting
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(
+            pool_connections=4, pool_maxsize=16,
+            max_retries=Retry(total=5, backoff_factor=1.0,
+                              status_forcelist=[429, 502, 503, 504],
+                              allowed_methods=['GET', 'POST'],
+                              respect_retry_after_header=True)
+        ))
+        self.session.headers['Connection'] = 'keep-alive'
+
+        # Serialized config-override bytes, filled by _update_mcp_config
+        self._mcp_config_cache = None
+
+        # Background `docker compose up -d` process, joined while waiting
+        # for services
+        self._compose_up_proc = None
+
+        # Background result writer: results are serialized on the main
+        # thread but written to disk by a daemon thread so the campaign
+        # summary isn't blocked on file IO; cleanup() drains the queue
+        self._writer_queue = queue.Queue()
+        threading.Thread(target=self._writer_loop, daemon=True).start()
+
         print("Containerized AI-Assisted Grid Penetration Testing Demo")
         print("Using existing ROI UNCC Docker infrastructure")
         if config_file:
             print(f"Configuration: {config_file}")
         print("=" * 60)
     
+    def _writer_loop(self):
+        """Drain (path, bytes) pairs from the writer queue onto disk"""
+        while True:
+            path, data = self._writer_queue.get()
+            try:
+                with open(path, 'wb') as f:
+                    f.write(data)
+            except Exception as e:
+                print(f"⚠️  Warning: could not write {path}: {e}")
+            finally:
+                self._writer_queue.task_done()
+
+    def _save_result(self, path, obj):
+        """Hand a result off to the background writer thread"""
+        self._writer_queue.put((path, serialize_json_result(obj)))
+
     def setup_signal_handlers(self):
         """Setup signal handlers for clean shutdown"""
         def signal_handler(signum, frame):
@@ -77,32 +205,39 @@ class ContainerizedDemo:
         
         # Determine config file path
         if config_file is None:
-            config_file = os.path.join(self.demo_dir, 'config', 'demo_config.yaml')
+            config_file = DEFAULT_CONFIG_PATH
         elif not os.path.isabs(config_file):
-            config_file = os.path.join(self.demo_dir, config_file)
+            config_file = os.path.join(DEMO_DIR, config_file)
         
-        # Load from file if exists
-        if os.path.exists(config_file):
+        # Load from file if present. EAFP: opening directly avoids the
+        # extra os.path.exists stat and a TOCTOU race.
+        try:
+            # Read the whole file once and hand the string to the loader
+            # to avoid PyYAML's line-by-line IO wrapper
+            with open(config_file, 'r') as f:
+                config_text = f.read()
+        except FileNotFoundError:
+            print(f"ℹ️  Configuration file {config_file} not found, using defaults")
+        else:
             try:
-                with open(config_file, 'r') as f:
-                    file_config = yaml.safe_load(f)
-                
-                # Deep merge configurations
-                def merge_dict(base, update):
+                file_config = _coerce_config_types(
+                    yaml.load(config_text, Loader=YamlBaseLoader) or {})
+
+                # Deep merge configurations iteratively: an explicit work
+                # list of (base, update) dict pairs avoids per-key recursion
+                pending = deque([(default_config, file_config)])
+                while pending:
+                    base, update = pending.popleft()
                     for key, value in update.items():
                         if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                            merge_dict(base[key], value)
+                            pending.append((base[key], value))
                         else:
                             base[key] = value
-                
-                merge_dict(default_config, file_config)
                 print(f"✅ Loaded configuration from {config_file}")
-                
+
             except Exception as e:
                 print(f"⚠️  Warning: Could not load config file {config_file}: {e}")
                 print("   Using default configuration")
-        else:
-            print(f"ℹ️  Configuration file {config_file} not found, using defaults")
         
         # Add derived values
         default_config['mcp_server_url'] = 'http://localhost:5000'
@@ -112,149 +247,182 @@ class ContainerizedDemo:
         
         return default_config
     
+    async def _run_async(self, *argv, cwd=None):
+        """Run a command via asyncio.subprocess, returning (rc, output)"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv, cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
+            )
+        except FileNotFoundError:
+            return -1, ''
+        stdout, _ = await process.communicate()
+        return process.returncode, stdout.decode(errors='replace')
+
+    async def _check_prerequisites_async(self):
+        """Run the independent docker probes concurrently"""
+        return await asyncio.gather(
+            self._run_async('docker', 'info', '--format', '{{json .}}'),
+            self._run_async('docker', 'image', 'inspect', 'roi-uncc-img:latest')
+        )
+
     def check_prerequisites(self):
         """Check if Docker and docker-compose are available"""
         print("Checking prerequisites...")
-        
-        # Check Docker
-        try:
-            result = subprocess.run(['docker', '--version'], capture_output=True, text=True)
-            if result.returncode != 0:
-                print("❌ Docker is not available")
-                return False
-            print(f"✅ {result.stdout.strip()}")
-        except FileNotFoundError:
-            print("❌ Docker is not installed")
+
+        # A single `docker info` answers daemon availability, server version
+        # and compose-plugin presence in one spawn; `docker image inspect`
+        # stops at the first match instead of listing all images. Both run
+        # concurrently.
+        info_check, image_check = asyncio.run(self._check_prerequisites_async())
+
+        # Check Docker daemon
+        rc, output = info_check
+        if rc != 0:
+            print("❌ Docker is not available")
             return False
-        
-        # Check docker compose (v2)
         try:
-            result = subprocess.run(['docker', 'compose', 'version'], capture_output=True, text=True)
-            if result.returncode != 0:
-                print("❌ docker compose is not available")
-                return False
-            print(f"✅ {result.stdout.strip()}")
-        except FileNotFoundError:
-            print("❌ docker compose is not installed")
+            info = fast_json_loads(output)
+        except ValueError:
+            print("❌ Docker is not available")
             return False
-        
+        print(f"✅ Docker server version {info.get('ServerVersion', 'unknown')}")
+
+        # Check docker compose (v2 plugin)
+        plugins = (info.get('ClientInfo') or {}).get('Plugins') or []
+        if not any(plugin.get('Name') == 'compose' for plugin in plugins):
+            print("❌ docker compose is not available")
+            return False
+        print("✅ docker compose plugin found")
+
         # Check for base container image
-        result = subprocess.run(['docker', 'images', '-q', 'roi-uncc-img:latest'], 
-                              capture_output=True, text=True)
-        if not result.stdout.strip():
+        rc, _ = image_check
+        if rc != 0:
             print("❌ Base container 'roi-uncc-img:latest' not found")
             print("   Please build the base container first:")
             print("   cd containers/docker && docker build -t roi-uncc-img:latest .")
             return False
         print("✅ Base container roi-uncc-img:latest found")
-        
-        # Check API key (optional for local models)
-        api_key_file = os.path.join(self.demo_dir, 'API.txt')
-        if not os.path.exists(api_key_file):
+
+        # Check API key (optional for local models). EAFP: the open doubles
+        # as the existence check without a separate stat.
+        try:
+            with open(API_KEY_PATH, 'r'):
+                pass
+            print("✅ API key file found")
+        except FileNotFoundError:
             # Check if using local model or API key provided
             if not self.config.get('ai_api_key') and not self.config.get('ai_base_url', '').startswith(('http://localhost', 'http://nginx-lb', 'http://host.docker.internal')):
                 print("⚠️  Warning: API.txt file not found")
                 print("   If using external AI API, provide --ai-api-key or create API.txt")
                 # Create empty API.txt to avoid build issues
-                with open(api_key_file, 'w') as f:
+                with open(API_KEY_PATH, 'w') as f:
                     f.write('local-llm-key')
-        else:
-            print("✅ API key file found")
         
         return True
     
+    async def _build_mcp_container_async(self):
+        """Build the MCP image while tearing down any stale compose stack
+
+        The docker build and the `compose down -v` cleanup touch disjoint
+        state, so they run concurrently.
+        """
+        build_result, _ = await asyncio.gather(
+            self._run_async('docker', 'build', '-f', 'Dockerfile.mcp',
+                            '-t', 'roi-uncc-mcp:latest', '.', cwd=self.demo_dir),
+            self._run_async('docker', 'compose', '-f', self.compose_file,
+                            'down', '-v', cwd=self.demo_dir)
+        )
+        return build_result
+
     def build_mcp_container(self):
-        """Build the MCP server container"""
+        """Build the MCP server container (and clean up stale containers)"""
         print("\n🔨 Building MCP server container...")
-        
-        cmd = ['docker', 'build', '-f', 'Dockerfile.mcp', '-t', 'roi-uncc-mcp:latest', '.']
-        process = subprocess.run(cmd, cwd=self.demo_dir)
-        
-        if process.returncode != 0:
+        print("   Cleaning up any existing containers...")
+
+        rc, output = asyncio.run(self._build_mcp_container_async())
+
+        if rc != 0:
+            print(output)
             print("❌ Failed to build MCP container")
             return False
-        
+
         print("✅ MCP container built successfully")
         return True
-    
+
     def start_services(self):
         """Start all Docker services"""
         print("\n🚀 Starting containerized services...")
-        
-        # Clean up any existing containers first
-        print("   Cleaning up any existing containers...")
-        cleanup_cmd = ['docker', 'compose', '-f', self.compose_file, 'down', '-v']
-        subprocess.run(cleanup_cmd, cwd=self.demo_dir, capture_output=True)
-        
+
         # Update HELICS broker address in MCP config
         self._update_mcp_config()
-        
+
+        # Launch `compose up -d` without waiting for it: the MCP server can
+        # become reachable before the compose CLI exits, so the readiness
+        # probe in wait_for_services starts polling immediately and the
+        # process is joined there.
         cmd = ['docker', 'compose', '-f', self.compose_file, 'up', '-d']
-        process = subprocess.run(cmd, cwd=self.demo_dir)
-        
-        if process.returncode != 0:
-            print("❌ Failed to start services")
-            return False
-        
-        print("✅ Services started")
+        self._compose_up_proc = subprocess.Popen(cmd, cwd=self.demo_dir)
+
+        print("✅ Services starting")
         return True
     
     def _update_mcp_config(self):
-        """Update MCP configuration for Docker network and AI settings"""
-        config_file = os.path.join(self.demo_dir, 'mcp-server', 'config', 'mcp.yaml')
-        
+        """Write the MCP config override for Docker network and AI settings"""
+        # The baseline config ships with the server image (config/mcp.yaml);
+        # the launcher never reads it. It only writes the handful of fields
+        # it controls into a small JSON override that the server merges on
+        # top of the base at startup, so the launch path does no YAML work
+        # at all.
         try:
-            with open(config_file, 'r') as f:
-                mcp_config = yaml.safe_load(f)
-            
-            # Update HELICS configuration
-            if 'grid' in self.config and 'helics' in self.config['grid']:
-                helics_config = self.config['grid']['helics']
-                if 'helics' not in mcp_config:
-                    mcp_config['helics'] = {}
-                mcp_config['helics']['broker_address'] = helics_config.get('broker_address', 'tcp://helics-broker:23406')
-                mcp_config['helics']['federate_name'] = helics_config.get('federate_name', 'mcp_attacker')
-                mcp_config['helics']['time_delta'] = helics_config.get('time_delta', 1.0)
-                mcp_config['helics']['period'] = helics_config.get('period', 1.0)
-            else:
-                # Default HELICS config for Docker
-                if 'helics' not in mcp_config:
-                    mcp_config['helics'] = {}
-                mcp_config['helics']['broker_address'] = 'tcp://helics-broker:23406'
-            
-            # Update AI configuration
+            helics_config = self.config.get('grid', {}).get('helics', {})
+            override = {
+                'helics': {
+                    'broker_address': helics_config.get('broker_address', 'tcp://helics-broker:23406')
+                }
+            }
+            if helics_config:
+                override['helics']['federate_name'] = helics_config.get('federate_name', 'mcp_attacker')
+                override['helics']['time_delta'] = helics_config.get('time_delta', 1.0)
+                override['helics']['period'] = helics_config.get('period', 1.0)
+
             if 'ai' in self.config:
                 ai_config = self.config['ai']
-                if 'ai' not in mcp_config:
-                    mcp_config['ai'] = {}
-                
-                mcp_config['ai']['model'] = ai_config.get('model', 'Qwen/Qwen3-30B-A3B')
-                mcp_config['ai']['api_base'] = ai_config.get('api_base', 'http://nginx-lb/v1')
-                mcp_config['ai']['temperature'] = ai_config.get('temperature', 0.8)
-                mcp_config['ai']['max_tokens'] = ai_config.get('max_tokens', 4000)
-                
-                print(f"   Using AI model: {mcp_config['ai']['model']}")
-                print(f"   Using AI base URL: {mcp_config['ai']['api_base']}")
-                
+                override['ai'] = {
+                    'model': ai_config.get('model', 'Qwen/Qwen3-30B-A3B'),
+                    'api_base': ai_config.get('api_base', 'http://nginx-lb/v1'),
+                    'temperature': ai_config.get('temperature', 0.8),
+                    'max_tokens': ai_config.get('max_tokens', 4000)
+                }
+
+                print(f"   Using AI model: {override['ai']['model']}")
+                print(f"   Using AI base URL: {override['ai']['api_base']}")
+
                 # Handle API key
                 api_key = ai_config.get('api_key', '')
                 if api_key:
                     # Write API key to file
-                    api_key_file = os.path.join(self.demo_dir, 'API.txt')
-                    with open(api_key_file, 'w') as f:
+                    with open(API_KEY_PATH, 'w') as f:
                         f.write(api_key)
                     print("   Using provided API key")
                 elif ai_config.get('api_key_file'):
                     api_key_file = ai_config['api_key_file']
                     if not os.path.isabs(api_key_file):
-                        api_key_file = os.path.join(self.demo_dir, api_key_file)
+                        api_key_file = os.path.join(DEMO_DIR, api_key_file)
                     if os.path.exists(api_key_file):
                         print(f"   Using API key from {api_key_file}")
-            
-            with open(config_file, 'w') as f:
-                yaml.dump(mcp_config, f, default_flow_style=False)
-            
-            print("✅ Updated MCP configuration")
+
+            # The override is a pure function of self.config, so only touch
+            # the file when the serialized bytes actually changed
+            new_bytes = serialize_json_result(override)
+            if new_bytes != self._mcp_config_cache:
+                with open(MCP_CONFIG_OVERRIDE_PATH, 'wb') as f:
+                    f.write(new_bytes)
+                print("✅ Updated MCP configuration override")
+            else:
+                print("✅ MCP configuration unchanged")
+            self._mcp_config_cache = new_bytes
         except Exception as e:
             print(f"⚠️  Warning: Could not update MCP config: {e}")
     
@@ -263,25 +431,64 @@ class ContainerizedDemo:
         print(f"\n⏳ Waiting for services to initialize (timeout: {self.config['startup_timeout']}s)...")
         
         start_time = time.time()
-        
-        # Wait for MCP server
+
+        # Wait for MCP server. Exponential backoff keeps the first probes
+        # tight (100 ms) so we notice readiness quickly, without hammering
+        # the server once the wait drags on. When the HTTP endpoint answers,
+        # switch to the /api/ready long-poll so a single request blocks until
+        # the federation is active.
         mcp_ready = False
+        delay = 0.1
         while (time.time() - start_time) < self.config['startup_timeout']:
+            # Fail fast if `compose up -d` (still running in the background)
+            # exited with an error
+            if self._compose_up_proc is not None:
+                rc = self._compose_up_proc.poll()
+                if rc is not None:
+                    self._compose_up_proc = None
+                    if rc != 0:
+                        print("\n❌ Failed to start services")
+                        return False
             try:
-                response = requests.get(f"{self.config['mcp_server_url']}/api/status", timeout=2)
+                remaining = self.config['startup_timeout'] - (time.time() - start_time)
+                wait = max(1, min(30, int(remaining)))
+                response = self.session.get(
+                    f"{self.config['mcp_server_url']}/api/ready",
+                    params={'wait': wait}, timeout=wait + 5
+                )
                 if response.status_code == 200:
-                    status = response.json()
-                    if status.get('server', {}).get('federation_active', False):
+                    if response.json().get('ready', False):
                         mcp_ready = True
                         break
+                    # Server is up but federation not active yet; the long
+                    # poll already consumed the wait, retry quickly
+                    delay = 0.1
+                elif response.status_code == 404:
+                    # Older server image without /api/ready; fall back to
+                    # polling /api/status
+                    response = self.session.get(f"{self.config['mcp_server_url']}/api/status", timeout=2)
+                    if response.status_code == 200:
+                        status = response.json()
+                        if status.get('server', {}).get('federation_active', False):
+                            mcp_ready = True
+                            break
             except:
                 pass
-            
-            time.sleep(2)
+
+            time.sleep(delay)
+            delay = min(delay * 1.5, 2.0)
             print(".", end="", flush=True)
-        
+
         print()
-        
+
+        # Join the backgrounded compose process if it is still running
+        if self._compose_up_proc is not None:
+            rc = self._compose_up_proc.wait()
+            self._compose_up_proc = None
+            if rc != 0:
+                print("❌ Failed to start services")
+                return False
+
         if mcp_ready:
             print("✅ All services are ready!")
             return True
@@ -293,12 +500,21 @@ class ContainerizedDemo:
     def _show_service_logs(self):
         """Show service logs for debugging"""
         print("\n📋 Service logs for debugging:")
-        
+
         services = ['helics-broker', 'gridpack-federate', 'gridlabd-federate', 'mcp-server']
-        for service in services:
-            print(f"\n--- {service} logs ---")
+
+        def fetch_logs(service):
             cmd = ['docker', 'compose', '-f', self.compose_file, 'logs', '--tail=10', service]
-            subprocess.run(cmd, cwd=self.demo_dir)
+            result = subprocess.run(cmd, cwd=self.demo_dir, capture_output=True, text=True)
+            return result.stdout + result.stderr
+
+        # Fetch all service logs concurrently (each `compose logs` spawn has
+        # its own IPC latency), but print them in a fixed order so the
+        # output stays readable
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            for service, logs in zip(services, executor.map(fetch_logs, services)):
+                print(f"\n--- {service} logs ---")
+                print(logs, end='')
     
     def run_ai_demo(self):
         """Run AI-assisted attack demo"""
@@ -316,20 +532,19 @@ class ContainerizedDemo:
                 }
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.config['mcp_server_url']}/api/ai/execute",
                 json=campaign_data,
                 timeout=self.config['simulation_duration'] + 30
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = fast_json_loads(response.content)
                 
                 # Save results
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 result_file = os.path.join(self.results_dir, f'ai_campaign_{timestamp}.json')
-                with open(result_file, 'w') as f:
-                    json.dump(result, f, indent=2)
+                self._save_result(result_file, result)
                 
                 print(f"✅ AI campaign completed!")
                 print(f"   Attacks executed: {result.get('attack_count', 0)}")
@@ -357,20 +572,19 @@ class ContainerizedDemo:
                 }
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.config['mcp_server_url']}/api/random/execute",
                 json=campaign_data,
                 timeout=self.config['simulation_duration'] + 30
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = fast_json_loads(response.content)
                 
                 # Save results
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 result_file = os.path.join(self.results_dir, f'random_campaign_{timestamp}.json')
-                with open(result_file, 'w') as f:
-                    json.dump(result, f, indent=2)
+                self._save_result(result_file, result)
                 
                 print(f"✅ Random campaign completed!")
                 print(f"   Attacks executed: {result.get('attack_count', 0)}")
@@ -401,25 +615,42 @@ class ContainerizedDemo:
             }
             
             timeout = (self.config['simulation_duration'] * self.config['comparison_trials'] * 2) + 60
-            response = requests.post(
+            # Stream the response: the body scales with trials x duration,
+            # and requests would otherwise buffer and decode it eagerly
+            response = self.session.post(
                 f"{self.config['mcp_server_url']}/api/comparison",
                 json=campaign_data,
-                timeout=timeout
+                timeout=timeout,
+                stream=True
             )
-            
+
             if response.status_code == 200:
-                result = response.json()
-                
-                # Save results
+                content_length = int(response.headers.get('Content-Length') or 0)
+                if content_length > MAX_COMPARISON_RESPONSE_BYTES:
+                    print(f"❌ Comparison response too large ({content_length} bytes)")
+                    return None
+                raw = response.raw.read(decode_content=True)
+
+                # Save results — the raw bytes go straight to disk, skipping
+                # the parse + re-serialize round-trip
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 result_file = os.path.join(self.results_dir, f'comparison_{timestamp}.json')
-                with open(result_file, 'w') as f:
-                    json.dump(result, f, indent=2)
-                
+                self._writer_queue.put((result_file, raw))
+
                 print(f"✅ Comparison study completed!")
-                
-                # Display summary
-                metrics = result.get('comparison_metrics', {})
+
+                # Display summary; with simdjson only the metrics block is
+                # materialized — the per-trial traces stay as unparsed bytes
+                if simdjson is not None:
+                    doc = simdjson.Parser().parse(raw)
+                    try:
+                        metrics = doc['comparison_metrics'].as_dict()
+                    except KeyError:
+                        metrics = {}
+                    result = {'comparison_metrics': metrics, 'results_file': result_file}
+                else:
+                    result = fast_json_loads(raw)
+                    metrics = result.get('comparison_metrics', {})
                 print(f"\n📈 Results Summary:")
                 print(f"   AI mean effectiveness: {metrics.get('ai_mean', 0):.2f}")
                 print(f"   Random mean effectiveness: {metrics.get('random_mean', 0):.2f}")
@@ -439,6 +670,9 @@ class ContainerizedDemo:
     
     def cleanup(self):
         """Clean up Docker services"""
+        # Make sure queued result files hit disk before tearing down
+        self._writer_queue.join()
+
         print("\n🧹 Cleaning up Docker services...")
         
         cmd = ['docker', 'compose', '-f', self.compose_file, 'down', '-v']
@@ -9,33 +9,96 @@ import sys
 import time
 import json
 import argparse
+import hashlib
+import socket
 import subprocess
-import threading
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import signal
 
 # Add paths for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'mcp-server', 'src'))
 
+# orjson is an optional accelerator for the campaign result writes
+# (native float formatting instead of Python-level json.dump); fall
+# back to stdlib json when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps_result(obj):
+    """Serialize obj to indented JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+class SpawnedProcess:
+    """Minimal Popen-like handle for children created via os.posix_spawnp"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.returncode = None
+
+    def wait(self, timeout=None):
+        if self.returncode is not None:
+            return self.returncode
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+            if pid != 0:
+                self.returncode = os.waitstatus_to_exitcode(status)
+                return self.returncode
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(str(self.pid), timeout)
+            time.sleep(0.05)
+
 def run_command(cmd, cwd=None, output_file=None):
-    """Run a command and optionally capture output"""
-    print(f"Running: {cmd}")
+    """Run a command (argv list) and optionally capture output"""
+    print(f"Running: {' '.join(cmd)}")
     if cwd:
         print(f"Working directory: {cwd}")
-    
+
     try:
+        if cwd is None and output_file:
+            # posix_spawnp skips the Python subprocess machinery (and its
+            # close-fds table walk) entirely; only usable when no working
+            # directory change is needed, since posix_spawn has no cwd.
+            # setsid still puts the child in its own process group for
+            # cleanup()'s killpg.
+            fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                pid = os.posix_spawnp(
+                    cmd[0], cmd, dict(os.environ),
+                    file_actions=[(os.POSIX_SPAWN_DUP2, fd, 1),
+                                  (os.POSIX_SPAWN_DUP2, fd, 2)],
+                    setsid=True)
+            finally:
+                os.close(fd)
+            return SpawnedProcess(pid)
+
+        # start_new_session (vs preexec_fn=os.setsid) still gives each
+        # child its own process group for cleanup()'s killpg, but keeps
+        # CPython on the fast posix_spawn path instead of forking a
+        # Python trampoline per spawn. Commands are argv lists so no
+        # /bin/sh intermediate is forked either.
         if output_file:
-            with open(output_file, 'w') as f:
+            # One raw fd per spawn, duplicated into the child by Popen and
+            # closed in the parent right away: no TextIOWrapper buffer in
+            # between and no leaked descriptor if Popen raises
+            fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
                 process = subprocess.Popen(
-                    cmd, shell=True, cwd=cwd,
-                    stdout=f, stderr=subprocess.STDOUT,
-                    preexec_fn=os.setsid
+                    cmd, cwd=cwd,
+                    stdout=fd, stderr=fd,
+                    start_new_session=True
                 )
+            finally:
+                os.close(fd)
         else:
             process = subprocess.Popen(
-                cmd, shell=True, cwd=cwd,
-                preexec_fn=os.setsid
+                cmd, cwd=cwd,
+                start_new_session=True
             )
         return process
     except Exception as e:
@@ -62,7 +125,37 @@ class DemoLauncher:
             'simulation_duration': 60,  # seconds
             'comparison_trials': 3
         }
-    
+
+        # One persistent HTTP session for all status probes and campaign
+        # calls, so the readiness loops reuse a single TCP connection
+        # instead of handshaking on every probe. requests is imported
+        # lazily so argparse-only invocations (--help) skip the ~80 ms
+        # urllib3/ssl import chain entirely.
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(
+            pool_connections=1, pool_maxsize=1, max_retries=0))
+
+    def _port_open(self, port):
+        """Cheap TCP check: one connect_ex syscall instead of a full HTTP GET"""
+        s = socket.socket()
+        s.settimeout(0.2)
+        try:
+            return s.connect_ex(('127.0.0.1', port)) == 0
+        finally:
+            s.close()
+
+    def _probe_status(self, timeout=0.5):
+        """Probe /api/status once; returns the response or None"""
+        import requests
+        try:
+            return self._session.get(
+                f"http://localhost:{self.config['mcp_server_port']}/api/status",
+                timeout=timeout)
+        except requests.RequestException:
+            return None
+
     def setup_signal_handlers(self):
         """Setup signal handlers for clean shutdown"""
         def signal_handler(signum, frame):
@@ -77,14 +170,28 @@ class DemoLauncher:
         """Start HELICS broker"""
         print("\n=== Starting HELICS Broker ===")
         
-        broker_cmd = f"helics_broker -f 3 --loglevel=warning --port={self.config['helics_broker_port']}"
+        broker_cmd = ['helics_broker', '-f', '3', '--loglevel=warning',
+                      f"--port={self.config['helics_broker_port']}"]
         broker_log = os.path.join(self.results_dir, 'helics_broker.log')
         
         process = run_command(broker_cmd, output_file=broker_log)
         if process:
             self.processes.append(('helics_broker', process))
             print(f"HELICS broker started (PID: {process.pid})")
-            time.sleep(2)  # Allow broker to initialize
+
+            # Probe the broker port instead of sleeping a fixed 2 s; the
+            # broker usually accepts connections within a few hundred ms
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                try:
+                    socket.create_connection(
+                        ('127.0.0.1', self.config['helics_broker_port']),
+                        timeout=0.1).close()
+                    return True
+                except OSError:
+                    time.sleep(0.1)
+
+            print("Warning: HELICS broker port not accepting connections yet")
             return True
         return False
     
@@ -94,7 +201,7 @@ class DemoLauncher:
         
         # Start GridPACK federate
         print("Starting GridPACK federate...")
-        gpk_cmd = "./build/gpk-left-fed.x"
+        gpk_cmd = ['./build/gpk-left-fed.x']
         gpk_log = os.path.join(self.results_dir, 'gridpack.log')
         
         gpk_process = run_command(gpk_cmd, cwd=self.example_dir, output_file=gpk_log)
@@ -106,7 +213,7 @@ class DemoLauncher:
         
         # Start GridLAB-D federate
         print("Starting GridLAB-D federate...")
-        gld_cmd = "gridlabd IEEE13bus.glm"
+        gld_cmd = ['gridlabd', 'IEEE13bus.glm']
         gld_log = os.path.join(self.results_dir, 'gridlabd.log')
         
         gld_process = run_command(gld_cmd, cwd=self.example_dir, output_file=gld_log)
@@ -117,49 +224,79 @@ class DemoLauncher:
         time.sleep(5)  # Allow simulation to initialize
         return True
     
+    def ensure_requirements(self):
+        """Install MCP server requirements; skipped when requirements.txt is unchanged"""
+        req_path = os.path.join(self.mcp_dir, 'requirements.txt')
+        stamp = os.path.join(self.results_dir, '.reqs.sha256')
+        # Content hash rather than mtime: checkouts and copies touch the
+        # timestamp without changing the dependency set
+        with open(req_path, 'rb') as f:
+            current = hashlib.sha256(f.read()).hexdigest()
+        try:
+            with open(stamp) as f:
+                if f.read() == current:
+                    return
+        except OSError:
+            pass
+
+        print("Installing Python requirements...")
+        pip_cmd = ['pip', 'install', '--disable-pip-version-check', '--no-input', '-q',
+                   '-r', req_path]
+        pip_process = subprocess.run(pip_cmd, capture_output=True, text=True)
+        if pip_process.returncode != 0:
+            print(f"Warning: Some requirements may not have installed: {pip_process.stderr}")
+        else:
+            with open(stamp, 'w') as f:
+                f.write(current)
+
     def start_mcp_server(self):
         """Start MCP server"""
         print("\n=== Starting MCP Server ===")
-        
+
         # Install requirements first
-        print("Installing Python requirements...")
-        pip_cmd = f"pip install -r {os.path.join(self.mcp_dir, 'requirements.txt')}"
-        pip_process = subprocess.run(pip_cmd, shell=True, capture_output=True, text=True)
-        if pip_process.returncode != 0:
-            print(f"Warning: Some requirements may not have installed: {pip_process.stderr}")
-        
+        self.ensure_requirements()
+
         # Start MCP server
-        server_cmd = f"python3 {os.path.join(self.mcp_dir, 'src', 'server.py')}"
+        server_cmd = [sys.executable, os.path.join(self.mcp_dir, 'src', 'server.py')]
         server_log = os.path.join(self.results_dir, 'mcp_server.log')
         
         # Set environment variables
         env = os.environ.copy()
         env['PYTHONPATH'] = os.path.join(self.mcp_dir, 'src')
         
-        process = subprocess.Popen(
-            server_cmd, shell=True,
-            stdout=open(server_log, 'w'),
-            stderr=subprocess.STDOUT,
-            env=env,
-            preexec_fn=os.setsid
-        )
+        # Same raw-fd pattern as run_command: the parent never keeps a
+        # Python file object open for the child's log
+        fd = os.open(server_log, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            process = subprocess.Popen(
+                server_cmd,
+                stdout=fd, stderr=fd,
+                env=env,
+                start_new_session=True
+            )
+        finally:
+            os.close(fd)
         
         if process:
             self.processes.append(('mcp_server', process))
             print(f"MCP server started (PID: {process.pid})")
             
-            # Wait for server to be ready
+            # Wait for server to be ready; probe quickly right after the
+            # spawn (50 ms) and back off towards 1 s while it boots
             print("Waiting for MCP server to initialize...")
-            for i in range(30):  # Wait up to 30 seconds
-                try:
-                    response = requests.get(f"http://localhost:{self.config['mcp_server_port']}/api/status", timeout=2)
-                    if response.status_code == 200:
+            deadline = time.monotonic() + 30
+            delay = 0.05
+            while time.monotonic() < deadline:
+                # Only pay for an HTTP request once the port is even
+                # listening; until then a refused TCP connect is enough
+                if self._port_open(self.config['mcp_server_port']):
+                    response = self._probe_status()
+                    if response is not None and response.ok:
                         print("MCP server is ready!")
                         return True
-                except:
-                    pass
-                time.sleep(1)
-            
+                time.sleep(delay)
+                delay = min(delay * 1.5, 1.0)
+
             print("Warning: MCP server may not be fully ready")
             return True
         
@@ -169,21 +306,22 @@ class DemoLauncher:
         """Wait for simulation to be ready"""
         print("\n=== Waiting for Simulation to Initialize ===")
         
-        for i in range(60):  # Wait up to 60 seconds
-            try:
-                # Check MCP server status
-                response = requests.get(f"http://localhost:{self.config['mcp_server_port']}/api/status", timeout=2)
-                if response.status_code == 200:
+        deadline = time.monotonic() + 60
+        delay = 0.05
+        while time.monotonic() < deadline:
+            # Only pay for an HTTP request + JSON parse once the server
+            # port is even listening
+            if self._port_open(self.config['mcp_server_port']):
+                response = self._probe_status()
+                if response is not None and response.ok:
                     status = response.json()
                     if status.get('server', {}).get('federation_active', False):
                         print("Simulation federation is active!")
                         return True
-            except Exception as e:
-                pass
-            
-            print(f"Waiting for simulation... ({i+1}/60)")
-            time.sleep(1)
-        
+
+            time.sleep(delay)
+            delay = min(delay * 1.5, 1.0)
+
         print("Warning: Simulation may not be fully ready, proceeding anyway...")
         return False
     
@@ -193,7 +331,7 @@ class DemoLauncher:
         
         try:
             # Get initial status
-            response = requests.get(f"http://localhost:{self.config['mcp_server_port']}/api/status")
+            response = self._session.get(f"http://localhost:{self.config['mcp_server_port']}/api/status")
             print("Initial grid status:", json.dumps(response.json(), indent=2))
             
             # Execute AI campaign
@@ -205,7 +343,7 @@ class DemoLauncher:
             }
             
             print(f"Starting AI attack campaign (duration: {self.config['simulation_duration']}s)...")
-            response = requests.post(
+            response = self._session.post(
                 f"http://localhost:{self.config['mcp_server_port']}/api/ai/execute",
                 json=campaign_data,
                 timeout=self.config['simulation_duration'] + 30
@@ -216,8 +354,8 @@ class DemoLauncher:
                 
                 # Save results
                 ai_result_file = os.path.join(self.results_dir, f'ai_campaign_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-                with open(ai_result_file, 'w') as f:
-                    json.dump(result, f, indent=2)
+                with open(ai_result_file, 'wb', buffering=1<<20) as f:
+                    f.write(_dumps_result(result))
                 
                 print(f"AI campaign completed!")
                 print(f"Attacks executed: {result.get('attack_count', 0)}")
@@ -246,7 +384,7 @@ class DemoLauncher:
             }
             
             print(f"Starting random attack campaign (duration: {self.config['simulation_duration']}s)...")
-            response = requests.post(
+            response = self._session.post(
                 f"http://localhost:{self.config['mcp_server_port']}/api/random/execute",
                 json=campaign_data,
                 timeout=self.config['simulation_duration'] + 30
@@ -257,8 +395,8 @@ class DemoLauncher:
                 
                 # Save results
                 random_result_file = os.path.join(self.results_dir, f'random_campaign_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-                with open(random_result_file, 'w') as f:
-                    json.dump(result, f, indent=2)
+                with open(random_result_file, 'wb', buffering=1<<20) as f:
+                    f.write(_dumps_result(result))
                 
                 print(f"Random campaign completed!")
                 print(f"Attacks executed: {result.get('attack_count', 0)}")
@@ -287,7 +425,7 @@ class DemoLauncher:
             }
             
             print(f"Starting comparison study ({self.config['comparison_trials']} trials each)...")
-            response = requests.post(
+            response = self._session.post(
                 f"http://localhost:{self.config['mcp_server_port']}/api/comparison",
                 json=campaign_data,
                 timeout=(self.config['simulation_duration'] * self.config['comparison_trials'] * 2) + 60
@@ -298,8 +436,8 @@ class DemoLauncher:
                 
                 # Save results
                 comparison_result_file = os.path.join(self.results_dir, f'comparison_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-                with open(comparison_result_file, 'w') as f:
-                    json.dump(result, f, indent=2)
+                with open(comparison_result_file, 'wb', buffering=1<<20) as f:
+                    f.write(_dumps_result(result))
                 
                 print(f"Comparison study completed!")
                 
@@ -322,25 +460,90 @@ class DemoLauncher:
             print(f"Error in comparison demo: {e}")
             return None
     
+    def run_multi(self, modes, trials):
+        """Run several campaign modes via one server-side batched call"""
+        print("\n=== Running Batched Campaigns ===")
+
+        base_url = f"http://localhost:{self.config['mcp_server_port']}"
+        campaign_data = {
+            'campaign': {
+                'modes': list(modes),
+                'trials': trials,
+                'duration': self.config['simulation_duration']
+            }
+        }
+
+        try:
+            print(f"Starting batched campaigns {list(modes)} ({trials} trials each)...")
+            response = self._session.post(
+                f"{base_url}/api/batch",
+                json=campaign_data,
+                timeout=(self.config['simulation_duration'] * trials * max(len(modes), 1) * 2) + 60
+            )
+
+            if response.status_code == 404:
+                # Older server without /api/batch: fall back to one HTTP
+                # round trip per mode
+                print("Server has no /api/batch endpoint; running campaigns individually")
+                results = {}
+                for mode in modes:
+                    if mode == 'ai':
+                        results[mode] = self.run_ai_attack_demo()
+                    elif mode == 'random':
+                        results[mode] = self.run_random_attack_demo()
+                    else:
+                        print(f"Unknown batch mode: {mode}")
+                return results
+
+            if response.status_code == 200:
+                result = response.json()
+
+                # Save results
+                batch_result_file = os.path.join(self.results_dir, f'batch_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+                with open(batch_result_file, 'wb', buffering=1<<20) as f:
+                    f.write(_dumps_result(result))
+
+                print(f"Batched campaigns completed!")
+                print(f"Results saved to: {batch_result_file}")
+
+                return result
+            else:
+                print(f"Batched campaigns failed: {response.status_code} - {response.text}")
+                return None
+
+        except Exception as e:
+            print(f"Error in batched campaigns: {e}")
+            return None
+
     def cleanup(self):
         """Clean up processes"""
         print("\n=== Cleaning Up ===")
         
+        # First pass: signal every process group up front so the children
+        # shut down in parallel instead of one 5 s wait at a time
         for name, process in reversed(self.processes):
             try:
                 print(f"Terminating {name} (PID: {process.pid})")
                 os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-                
-                # Wait for graceful shutdown
+            except Exception as e:
+                print(f"Error terminating {name}: {e}")
+
+        # Second pass: one shared 5 s deadline for the whole set; anything
+        # still alive when it expires is force-killed
+        deadline = time.monotonic() + 5
+        for name, process in reversed(self.processes):
+            remain = max(0, deadline - time.monotonic())
+            try:
+                process.wait(timeout=remain)
+            except subprocess.TimeoutExpired:
+                print(f"Force killing {name}")
                 try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    print(f"Force killing {name}")
                     os.killpg(os.getpgid(process.pid), signal.SIGKILL)
-                    
+                except Exception:
+                    pass
             except Exception as e:
-                print(f"Error terminating {name}: {e}")
-        
+                print(f"Error waiting for {name}: {e}")
+
         self.processes.clear()
         print("Cleanup completed")
     
@@ -360,14 +563,24 @@ class DemoLauncher:
                 print("Failed to start HELICS broker")
                 return False
             
-            if not self.start_grid_simulation():
+            # The grid federates and the MCP server only depend on the
+            # broker, not on each other; launch them in parallel so their
+            # initialization waits (and the pip install) overlap instead
+            # of running back to back
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                grid_future = executor.submit(self.start_grid_simulation)
+                mcp_future = executor.submit(self.start_mcp_server)
+                grid_ok = grid_future.result()
+                mcp_ok = mcp_future.result()
+
+            if not grid_ok:
                 print("Failed to start grid simulation")
                 return False
-            
-            if not self.start_mcp_server():
+
+            if not mcp_ok:
                 print("Failed to start MCP server")
                 return False
-            
+
             # Wait for everything to be ready
             self.wait_for_simulation_ready()
             
@@ -16,8 +16,14 @@ import numpy as np
 import os
 
 logger = logging.getLogger(__name__)
-logger.addHandler(logging.StreamHandler())
-logger.setLevel(logging.DEBUG)
+# HELICS_QUIET=1 silences the per-tick records for production runs;
+# default keeps the chatty DEBUG stream for interactive debugging
+if os.environ.get('HELICS_QUIET'):
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.WARNING)
+else:
+    logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.DEBUG)
 
 def destroy_federate(fed):
     '''
@@ -54,24 +60,28 @@ def create_value_federate(fedinitstring,name,period):
 if __name__ == "__main__":
     
     ##########  Registering  federate and configuring with API################
-    fedinitstring = " --federates=1"
+    # All federates here are separate OS processes under one zmq broker
+    # (see pf-cosim.json), so a shared in-process core is not an option;
+    # disabling the periodic heartbeat tick removes the recurring
+    # keep-alive traffic between each core and the broker instead
+    fedinitstring = " --federates=1 --tick=0"
     name = "Full PowerFlow"
     period = 1.0
     fed = create_value_federate(fedinitstring,name,period)
-    logger.info(f'Created federate {name}')
+    logger.info('Created federate %s', name)
     print(f'Created federate {name}')
 
     Vc_mag_id = h.helicsFederateRegisterGlobalTypePublication(fed, 'Vc_mag_full', 'double', 'V')
-    logger.debug(f'\tRegistered publication---> Vc_mag_full')
+    logger.debug('\tRegistered publication---> Vc_mag_full')
 
     Vc_ph_id = h.helicsFederateRegisterGlobalTypePublication(fed, 'Vc_ph_full', 'double', 'deg')
-    logger.debug(f'\tRegistered publication---> Vc_ph_full')
+    logger.debug('\tRegistered publication---> Vc_ph_full')
 
     Pc_id = h.helicsFederateRegisterGlobalTypePublication(fed,'Pc_full', 'MW')
-    logger.debug(f'\tRegistered subscription---> Pc_full')
+    logger.debug('\tRegistered subscription---> Pc_full')
 
     Qc_id = h.helicsFederateRegisterGlobalTypePublication(fed,'Qc_full', 'MVAR')
-    logger.debug(f'\tRegistered subscription---> Qc_full')
+    logger.debug('\tRegistered subscription---> Qc_full')
 
     ##############  Entering Execution Mode  ##################################
     h.helicsFederateEnterExecutingMode(fed)
@@ -92,26 +102,26 @@ if __name__ == "__main__":
         
         # Time request for the next physical interval to be simulated
         requested_time = (grantedtime+update_interval)
-        logger.debug(f'Requesting time {requested_time}')
+        logger.debug('Requesting time %s', requested_time)
 
         grantedtime = h.helicsFederateRequestTime (fed, requested_time)
-        logger.debug(f'Granted time {grantedtime}')
+        logger.debug('Granted time %s', grantedtime)
 
         # Calculate Full Power Flow
         [Vc_mag,Vc_ph,Pc,Qc]=pf.full_powerflow(r,x,ratio)
 
         # Publish Power Flow results for center bus
         h.helicsPublicationPublishDouble(Vc_mag_id, Vc_mag)
-        logger.debug(f'\tPublished Vc_mag_full with value {Vc_mag}')
+        logger.debug('\tPublished Vc_mag_full with value %s', Vc_mag)
         
         h.helicsPublicationPublishDouble(Vc_ph_id,Vc_ph)
-        logger.debug(f'\tPublished V_ph_full with value {Vc_ph}')
+        logger.debug('\tPublished V_ph_full with value %s', Vc_ph)
         
         h.helicsPublicationPublishDouble(Pc_id, Pc)
-        logger.debug(f'\tPublished Pc_full with value {Pc}')
+        logger.debug('\tPublished Pc_full with value %s', Pc)
 
         h.helicsPublicationPublishDouble(Qc_id, Qc)
-        logger.debug(f'\tPublished Qc_full  with value {Qc}')
+        logger.debug('\tPublished Qc_full  with value %s', Qc)
 
     # Cleaning up HELICS stuff once we've finished the co-simulation.
     destroy_federate(fed)
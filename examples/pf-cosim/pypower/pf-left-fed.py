@@ -12,12 +12,17 @@ eshoubak@uncc.edu
 import helics as h
 import pf
 import logging
-import numpy as np
 import os
 
 logger = logging.getLogger(__name__)
-logger.addHandler(logging.StreamHandler())
-logger.setLevel(logging.DEBUG)
+# HELICS_QUIET=1 silences the per-tick records for production runs;
+# default keeps the chatty DEBUG stream for interactive debugging
+if os.environ.get('HELICS_QUIET'):
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.WARNING)
+else:
+    logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.DEBUG)
 
 def destroy_federate(fed):
     '''
@@ -45,7 +50,9 @@ def create_value_federate(fedinitstring,name,period):
     h.helicsFederateInfoSetCoreInitString(fedinfo, fedinitstring)
     h.helicsFederateInfoSetIntegerProperty(fedinfo, h.helics_property_int_log_level, 1)
     h.helicsFederateInfoSetTimeProperty(fedinfo, h.helics_property_time_period, period)
-    h.helicsFederateInfoSetFlagOption(fedinfo, h.helics_flag_uninterruptible, False)
+    # Uninterruptible: this federate only ever advances by its period,
+    # so skip the per-request check for earlier interrupting updates
+    h.helicsFederateInfoSetFlagOption(fedinfo, h.helics_flag_uninterruptible, True)
     h.helicsFederateInfoSetFlagOption(fedinfo, h.HELICS_FLAG_TERMINATE_ON_ERROR, True)
     h.helicsFederateInfoSetFlagOption(fedinfo, h.helics_flag_wait_for_current_time_update, False)
     fed = h.helicsCreateValueFederate(name, fedinfo)
@@ -54,24 +61,25 @@ def create_value_federate(fedinitstring,name,period):
 if __name__ == "__main__":
     
     ##########  Registering  federate and configuring with API################
-    fedinitstring = " --federates=1"
+    # All federates here are separate OS processes under one zmq broker
+    # (see pf-cosim.json), so a shared in-process core is not an option;
+    # disabling the periodic heartbeat tick removes the recurring
+    # keep-alive traffic between each core and the broker instead
+    fedinitstring = " --federates=1 --tick=0"
     name = "Left PowerFlow"
     period = 1.0
     fed = create_value_federate(fedinitstring,name,period)
-    logger.info(f'Created federate {name}')
+    logger.info('Created federate %s', name)
     print(f'Created federate {name}')
 
-    Vc_mag_id = h.helicsFederateRegisterGlobalTypePublication(fed, 'Vc_mag', 'double', 'V')
-    logger.debug(f'\tRegistered publication---> Vc_mag_full')
+    # Magnitude and phase travel together in one complex publication
+    # (mag in the real part, phase in deg in the imaginary part) so each
+    # tick costs a single ZMQ message instead of two
+    Vc_id = h.helicsFederateRegisterGlobalTypePublication(fed, 'Vc_pf', 'complex', '')
+    logger.debug('\tRegistered publication---> Vc_pf')
 
-    Vc_ph_id = h.helicsFederateRegisterGlobalTypePublication(fed, 'Vc_ph', 'double', 'deg')
-    logger.debug(f'\tRegistered publication---> Vc_ph_full')
-
-    Pc_id = h.helicsFederateRegisterSubscription(fed,'Pc', 'MW')
-    logger.debug(f'\tRegistered subscription---> Pc')
-
-    Qc_id = h.helicsFederateRegisterSubscription(fed,'Qc', 'MVAR')
-    logger.debug(f'\tRegistered subscription---> Qc')
+    Sc_id = h.helicsFederateRegisterSubscription(fed,'Sc', 'MVA')
+    logger.debug('\tRegistered subscription---> Sc')
 
     ##############  Entering Execution Mode  ##################################
     h.helicsFederateEnterExecutingMode(fed)
@@ -87,35 +95,46 @@ if __name__ == "__main__":
     x = 2.0
     ratio = 0.5
 
+    # Loop-invariant left-segment impedance
+    r_left = r*ratio
+    x_left = x*ratio
+
     # Initial Power flow
-    [Vc_mag,Vc_ph] =pf.left_powerflow(0,0,r*ratio,x*ratio)
+    [Vc_mag,Vc_ph] =pf.left_powerflow(0,0,r_left,x_left)
+
+    # Previous-step inputs, used to skip the solve when nothing changed
+    prev_Pc = 0.0
+    prev_Qc = 0.0
 
     # Publish initial center bus voltage
-    h.helicsPublicationPublishDouble(Vc_mag_id, Vc_mag)
-    h.helicsPublicationPublishDouble(Vc_ph_id, Vc_ph)
-    
+    h.helicsPublicationPublishComplex(Vc_id, Vc_mag, Vc_ph)
+
     # As long as granted time is in the time range to be simulated...
     while grantedtime < total_interval:
         
         # Time request for the next physical interval to be simulated
         requested_time = (grantedtime+update_interval)
-        logger.debug(f'Requesting time {requested_time}')
+        logger.debug('Requesting time %s', requested_time)
 
         grantedtime = h.helicsFederateRequestTime (fed, requested_time)
-        logger.debug(f'Granted time {grantedtime}')
+        logger.debug('Granted time %s', grantedtime)
 
-        # get right side P and Q flow
-        Pc = h.helicsInputGetDouble(Pc_id)
-        Qc = h.helicsInputGetDouble(Qc_id)
+        # get right side P and Q flow (packed as P + jQ)
+        Sc = h.helicsInputGetComplex(Sc_id)
+        Pc = Sc.real
+        Qc = Sc.imag
 
-        logger.debug(f'Recieved Pc = {Pc} and Qc = {Qc}')
+        logger.debug('Recieved Pc = %s and Qc = %s', Pc, Qc)
 
-        # Calculate right power flow
-        [Vc_mag,Vc_ph]=pf.left_powerflow(Pc,Qc,r*ratio,x*ratio)
+        # Calculate left power flow; at steady state the inputs repeat,
+        # so reuse the previous solution when the delta is negligible
+        if abs(Pc - prev_Pc) > 1e-9 or abs(Qc - prev_Qc) > 1e-9:
+            [Vc_mag,Vc_ph]=pf.left_powerflow(Pc,Qc,r_left,x_left)
+        prev_Pc = Pc
+        prev_Qc = Qc
 
         # Publish new voltage update
-        h.helicsPublicationPublishDouble(Vc_mag_id, Vc_mag)
-        h.helicsPublicationPublishDouble(Vc_ph_id, Vc_ph)
+        h.helicsPublicationPublishComplex(Vc_id, Vc_mag, Vc_ph)
         
 
     # Cleaning up HELICS stuff once we've finished the co-simulation.
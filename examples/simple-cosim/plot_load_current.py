@@ -5,24 +5,25 @@ import pandas as pd
 data = pd.read_csv('load_current_data.csv', delimiter=' ', names=['Real', 'Imaginary'])
 
 # Create time steps
-time_steps = list(range(len(data)))
+time_steps = range(len(data))
 
-# Plot the real part of the load current
-plt.figure(figsize=(10, 5))
-plt.plot(time_steps, data['Real'], label='Real Part of Load Current', linestyle='-', marker='o')
-plt.xlabel('Time Step')
-plt.ylabel('Current (A)')
-plt.title('Real Part of Load Current Over Time')
-plt.legend()
-plt.grid(True)
-plt.show()
+# Thin the markers so at most ~200 render regardless of row count;
+# past that matplotlib's marker path creation dominates plot build time
+markevery = max(1, len(data) // 200)
+
+def plot_part(ax, col, label, color):
+    ax.plot(time_steps, data[col], label=label, linestyle='-', marker='o',
+            markevery=markevery, color=color)
+    ax.set_ylabel('Current (A)')
+    ax.set_title(f'{label} Over Time')
+    ax.legend()
+    ax.grid(True)
 
-# Plot the imaginary part of the load current
-plt.figure(figsize=(10, 5))
-plt.plot(time_steps, data['Imaginary'], label='Imaginary Part of Load Current', linestyle='-', marker='o', color='r')
-plt.xlabel('Time Step')
-plt.ylabel('Current (A)')
-plt.title('Imaginary Part of Load Current Over Time')
-plt.legend()
-plt.grid(True)
+# One figure with both parts on a shared x-axis: a single canvas build
+# instead of two back-to-back figures
+fig, (ax_real, ax_imag) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
+plot_part(ax_real, 'Real', 'Real Part of Load Current', 'b')
+plot_part(ax_imag, 'Imaginary', 'Imaginary Part of Load Current', 'r')
+ax_imag.set_xlabel('Time Step')
+plt.tight_layout()
 plt.show()
@@ -1,55 +1,68 @@
 import pandas as pd
+import numpy as np
 import re
 import matplotlib.pyplot as plt
-
-def clean_line(line):
-    # Replace 'inf' and 'nan' with empty values
-    line = re.sub(r'\binf\b', '0.0', line)
-    line = re.sub(r'\bnan\b', '0.0', line)
-
-    # Remove unwanted characters like 'd', 'j', and time zone info like 'PST'
-    line = re.sub(r'[djPST]', '', line)
-
-    # Replace multiple spaces with a single space
-    line = re.sub(r'\s+', ' ', line)
-
-    # Replace multiple commas with a single comma
-    line = re.sub(r',+', ',', line)
-
-    return line.strip()
-
-def process_csv(file_path):
-    cleaned_lines = []
-    header_line = ''
+from matplotlib.ticker import FuncFormatter
+from datetime import datetime
+
+def downsample_minmax(x, y, bins=500):
+    # Bin-min/bin-max downsampling: keep the extremes of each time bin
+    # so the plotted envelope is preserved while the draw cost stays
+    # bounded (~2 points per bin) no matter how many rows the log has
+    n = len(y)
+    if n <= 2 * bins:
+        return x, y
+    xv = np.asarray(x)
+    yv = np.asarray(y)
+    edges = np.linspace(0, n, bins + 1, dtype=int)
+    keep = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi <= lo:
+            continue
+        seg = yv[lo:hi]
+        keep.append(lo + int(seg.argmin()))
+        keep.append(lo + int(seg.argmax()))
+    keep = sorted(set(keep))
+    return xv[keep], yv[keep]
+
+# Only the cleanup the C parser cannot do itself is left to regex: the
+# 'd'/'j' unit suffixes on values and the trailing time zone token on
+# timestamps. Both patterns are compiled once at module scope.
+_RE_DJ = re.compile(r'[dj]')
+_RE_TZ = re.compile(r'\s+[A-Z]{3,4}$')
+
+def read_header(file_path):
+    # The column names live on a '#'-prefixed metadata line; scan only
+    # the comment block at the top of the file to find it
     with open(file_path, 'r') as file:
-        for line_number, line in enumerate(file, start=1):
-            if line.startswith('#'):
-                # Capture header line to use in cleaned CSV
-                if 'timestamp' in line:  # Look for line that contains column names
-                    header_line = line[1:].strip()  # Remove '#' and strip
-                continue
+        for line in file:
+            if not line.startswith('#'):
+                break
+            if 'timestamp' in line:
+                return [col.strip() for col in line[1:].strip().split(',')]
+    return None
 
-            # Clean the line
-            cleaned_line = clean_line(line.strip())
-            cleaned_lines.append(cleaned_line)
-
-    # Write cleaned data to a new CSV file
-    cleaned_file_path = 'cleaned_load_data.csv'
-    with open(cleaned_file_path, 'w') as cleaned_file:
-        # Write header line to cleaned CSV
-        if header_line:
-            cleaned_file.write(header_line + '\n')
-        else:
-            print("Error: Header line not found.")
-            return
-
-        for cleaned_line in cleaned_lines:
-            cleaned_file.write(cleaned_line + '\n')
+def process_csv(file_path):
+    names = read_header(file_path)
+    if not names:
+        print("Error: Header line not found.")
+        return
 
-    # Load cleaned data with pandas
+    # Load the data with pandas
     try:
-        # Load the cleaned CSV into a dataframe with proper delimiter handling
-        df = pd.read_csv(cleaned_file_path, delimiter=',')
+        # The C parser does most of the old clean_line work natively:
+        # '#' metadata lines are skipped, inf/nan cells become NaN via
+        # na_values, and stray padding falls to skipinitialspace. Only
+        # the unit/timezone suffixes still need a vectorized pass.
+        # usecols keeps the parser from tokenizing the phase B/C and
+        # current columns this script never plots. (The cells still
+        # carry 'd'/'j' suffixes, so they load as strings and are
+        # downcast to float32 after the cleanup below.)
+        df = pd.read_csv(file_path, comment='#', header=None, names=names,
+                         usecols=['timestamp', 'measured_voltage_A',
+                                  'measured_power_A'],
+                         na_values=['inf', 'nan'], skipinitialspace=True,
+                         engine='c', dtype=str)
         if df.empty:
             print("No valid data found to plot.")
         else:
@@ -59,26 +72,57 @@ def process_csv(file_path):
             # Print the first few rows for verification
             print(df.head())
 
-            # Check if 'timestamp' is in columns after cleaning
-            df.columns = [col.strip() for col in df.columns]  # Remove any leading/trailing spaces from column names
             if 'timestamp' not in df.columns:
-                print("Error: 'timestamp' column not found in cleaned data.")
+                print("Error: 'timestamp' column not found in data.")
                 return
 
-            # Convert 'timestamp' to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+            # Strip the trailing time zone token (e.g. 'PST'), then pin
+            # the format so the parse stays on the vectorized C path;
+            # without format= pandas can fall back to per-row dateutil
+            timestamps = df['timestamp'].str.replace(_RE_TZ, '', regex=True)
+            fmt = None
+            sample = str(timestamps.iloc[0]).strip()
+            for candidate in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f',
+                              '%m/%d/%Y %H:%M:%S'):
+                try:
+                    datetime.strptime(sample, candidate)
+                except ValueError:
+                    continue
+                fmt = candidate
+                break
+            df['timestamp'] = pd.to_datetime(timestamps, format=fmt,
+                                             errors='coerce', cache=True)
 
             # Dropping rows where timestamp is NaT (due to parsing errors)
             df.dropna(subset=['timestamp'], inplace=True)
 
-            # Set timestamp as the index
-            df.set_index('timestamp', inplace=True)
+            # Strip the 'd'/'j' suffixes and coerce the value columns to
+            # numeric; unparsable cells (including the old inf/nan
+            # sentinels) become 0.0 as before. float32 halves the
+            # bandwidth through pandas and matplotlib at plot precision.
+            for col in df.columns:
+                if col != 'timestamp':
+                    df[col] = (pd.to_numeric(df[col].str.replace(_RE_DJ, '', regex=True),
+                                             errors='coerce')
+                                 .fillna(0.0).astype(np.float32))
+
+            # Plot against int64 epoch seconds instead of a
+            # DatetimeIndex: matplotlib converts datetime64 values to
+            # its own float ordinals point by point, which dominates
+            # layout time on long series. A plain integer axis skips
+            # that pass; the formatter below restores readable labels.
+            df['_ts'] = df['timestamp'].astype('int64') // 10**9
 
             # Plot some example columns, assuming the column names exist
             plt.figure(figsize=(10, 6))
             if 'measured_voltage_A' in df.columns and 'measured_power_A' in df.columns:
-                plt.plot(df.index, df['measured_voltage_A'], label='Voltage A', color='blue')
-                plt.plot(df.index, df['measured_power_A'], label='Power A', color='red')
+                ts = df['_ts'].values
+                tv, v = downsample_minmax(ts, df['measured_voltage_A'].values)
+                tp, p = downsample_minmax(ts, df['measured_power_A'].values)
+                plt.plot(tv, v, label='Voltage A', color='blue')
+                plt.plot(tp, p, label='Power A', color='red')
+                plt.gca().xaxis.set_major_formatter(FuncFormatter(
+                    lambda x, _: pd.Timestamp(x, unit='s').strftime('%H:%M')))
             else:
                 print("Error: Required columns ('measured_voltage_A' and 'measured_power_A') not found in data.")
                 return
@@ -96,5 +140,3 @@ def process_csv(file_path):
 
 if __name__ == "__main__":
     process_csv('load_data.csv')
-
-
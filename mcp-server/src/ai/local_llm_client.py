@@ -3,15 +3,95 @@
 Local LLM Client - Strategic attack planning and execution using local AI model
 """
 
+import hashlib
 import json
 import logging
+import re
 import time
 import requests
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import os
 
 logger = logging.getLogger(__name__)
 
+# orjson is an optional accelerator: its C encoder serializes the
+# multi-KB analysis context several times faster than stdlib json, and
+# its decoder raises a json.JSONDecodeError subclass so the existing
+# except clauses keep working
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    _loads = orjson.loads
+else:
+    def _dumps(obj, indent=False):
+        return json.dumps(obj, indent=2 if indent else None)
+    _loads = json.loads
+
+# Plan-cache sizing: entries older than the TTL are stale (the grid
+# may have drifted) and the LRU bound keeps a long campaign from
+# accumulating fingerprints without limit
+_PLAN_CACHE_TTL = 30.0
+_PLAN_CACHE_MAX = 128
+
+# Parameter-string parsers for _normalize_attack_parameters, compiled
+# once at import. The duration pattern accepts bare numbers and
+# s/sec/second(s) suffixes; the old .replace('s','') chain mangled
+# spelled-out units like "1 seconds" into unparsable text.
+_PCT_RE = re.compile(r'^\s*([+-]?\d+(?:\.\d+)?)\s*%\s*$')
+_DUR_RE = re.compile(r'^\s*([+-]?\d+(?:\.\d+)?)\s*(?:s|sec|seconds?)?\s*$')
+
+def _extract_json_object(text):
+    """Return the first balanced top-level JSON object in text, or None"""
+    # Single linear pass with string/escape tracking instead of a
+    # greedy DOTALL regex, which spanned from the first '{' to the last
+    # '}' regardless of nesting and backtracks quadratically on long
+    # reasoning dumps
+    start = text.find('{')
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def _bucket_state(current_state):
+    """Coarse fingerprint of a grid snapshot for plan caching"""
+    # Voltages are rounded into 0.02-wide buckets and the timestamp is
+    # dropped, so snapshots taken seconds apart on a stable grid hash
+    # to the same key
+    bucket = {}
+    for name, value in (current_state.get('voltages') or {}).items():
+        try:
+            bucket[name] = round(float(value) / 0.02) * 0.02
+        except (TypeError, ValueError):
+            bucket[name] = str(value)
+    bucket['system_health'] = current_state.get('system_health')
+    return bucket
+
 class LocalLLMStrategist:
     """Local LLM-powered strategic attack planning"""
     
@@ -20,14 +100,38 @@ class LocalLLMStrategist:
         self.attack_engine = attack_engine
         self.grid_monitor = grid_monitor
         
-        # Load API key
-        self.api_key = self._load_api_key()
-        
         # Local LLM API configuration (OpenAI-compatible)
         self.api_base = config.get('api_base', 'http://host.docker.internal:8000/v1')
+        # Computed once: _load_api_key and the session setup below both
+        # branch on whether the endpoint is local
+        self._is_local = any(host in self.api_base for host in
+                             ('localhost', '127.0.0.1', 'host.docker.internal'))
+        
+        # Load API key
+        self.api_key = self._load_api_key()
         self.model = config.get('model', 'Qwen/Qwen3-30B-A3B')
         self.temperature = config.get('temperature', 0.8)
         self.max_tokens = config.get('max_tokens', 2000)
+        self.cache_prompt = config.get('cache_prompt', True)
+        self.stream_early_stop = config.get('stream_early_stop', False)
+        
+        # One pooled session per strategist: keep-alive reuses the TCP
+        # (and TLS, for remote servers) connection across LLM turns
+        # instead of paying a fresh handshake per call, and transient
+        # gateway errors retry with backoff. Headers are registered once
+        # here instead of rebuilt on every request.
+        self._chat_url = f"{self.api_base}/chat/completions"
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=8,
+            max_retries=requests.adapters.Retry(
+                total=2, backoff_factor=0.2,
+                status_forcelist=[502, 503, 504]))
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({"Content-Type": "application/json"})
+        if not self._is_local:
+            self._session.headers["Authorization"] = f"Bearer {self.api_key}"
         
         # Strategic knowledge base
         self.grid_topology_knowledge = {
@@ -38,17 +142,55 @@ class LocalLLMStrategist:
             "vulnerabilities": ["helics_communication", "voltage_control", "power_flow_interface"]
         }
         
+        # Serialized once: the topology knowledge never changes, so
+        # every prompt reuses the same string instead of re-walking and
+        # re-indenting the dict
+        self._topology_json = _dumps(self.grid_topology_knowledge, indent=True)
+        
+        # The system prompt never changes between calls; building it
+        # once means every planning turn sends a byte-identical prefix,
+        # which servers with prefix caching (vLLM, SGLang) can reuse
+        # instead of re-prefilling it
+        self._system_prompt = self.get_strategic_system_prompt()
+        self._system_msg = {"role": "system", "content": self._system_prompt}
+        
         # Campaign tracking
         self.campaign_history = []
         self.current_campaign = None
         
+        # Single worker for adaptive replans: the LLM round-trip runs
+        # on this thread while execute_campaign sits in its pause
+        # between attacks, so inference overlaps the pacing window
+        # instead of extending it
+        self._plan_executor = ThreadPoolExecutor(max_workers=1)
+        
+        # Shared pool for grid-monitor I/O so plan_attack can fetch the
+        # state snapshot and the vulnerability assessment concurrently
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+        
+        # Technique -> handler dispatch for parameter normalization:
+        # one dict lookup per attack step instead of walking an
+        # if/elif chain with repeated isinstance and substring checks
+        self._normalizers = {
+            'inject_load': self._norm_inject_load,
+            'spoof_data': self._norm_spoof_data,
+            'block_command': self._norm_block_command,
+            'reconnaissance': lambda params: {},
+        }
+        
+        # Semantic plan cache: adaptive replans issued seconds apart on
+        # a stable grid rebuild essentially the same prompt, so a prior
+        # plan is reused instead of a fresh LLM round-trip. Keys are
+        # hashes of the model settings, objective, vulnerabilities, and
+        # bucketed grid state; OrderedDict gives LRU eviction.
+        self._plan_cache = OrderedDict()
+        
         logger.info("Local LLM strategist initialized")
     
     def _load_api_key(self):
         """Load API key (optional for local LLM)"""
         # Check if using local LLM first
-        api_base = self.config.get('api_base', 'http://host.docker.internal:8000/v1')
-        if 'localhost' in api_base or '127.0.0.1' in api_base or 'host.docker.internal' in api_base:
+        if self._is_local:
             logger.info("Using local LLM - API key not required")
             return "local-llm-key"
             
@@ -71,17 +213,45 @@ class LocalLLMStrategist:
             logger.error(f"Failed to load API key: {e}")
             raise
     
+    def _call_llm_api_streaming(self, payload):
+        """Stream the completion, stopping once a full JSON plan arrives"""
+        payload = dict(payload)
+        payload["stream"] = True
+        content = ''
+        with self._session.post(self._chat_url, data=_dumps(payload).encode(),
+                                timeout=(5, 60), stream=True) as response:
+            if response.status_code != 200:
+                logger.error(f"LLM API error: {response.status_code} - {response.text}")
+                raise Exception(f"API call failed: {response.status_code}")
+            
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    break
+                try:
+                    chunk = _loads(data)
+                except json.JSONDecodeError:
+                    continue
+                delta = chunk['choices'][0].get('delta', {})
+                piece = delta.get('content') or delta.get('reasoning_content') or ''
+                if piece:
+                    content += piece
+                    # Once the buffer holds a balanced top-level object
+                    # the plan is complete; leaving the with-block
+                    # closes the connection, which cancels the rest of
+                    # the generation server-side instead of decoding
+                    # the full max_tokens budget
+                    if '}' in piece and _extract_json_object(content):
+                        break
+        
+        # Mirror the non-streaming response shape so callers are agnostic
+        return {'choices': [{'message': {'content': content}}]}
+    
     def _call_llm_api(self, messages, tools=None):
         """Call Local LLM API (OpenAI-compatible)"""
         try:
-            headers = {
-                "Content-Type": "application/json"
-            }
-            
-            # Add authorization only if not using local LLM
-            if not ('localhost' in self.api_base or '127.0.0.1' in self.api_base or 'host.docker.internal' in self.api_base):
-                headers["Authorization"] = f"Bearer {self.api_key}"
-            
             payload = {
                 "model": self.model,
                 "messages": messages,
@@ -92,11 +262,21 @@ class LocalLLMStrategist:
             if tools:
                 payload["tools"] = tools
             
-            response = requests.post(
-                f"{self.api_base}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60  # Increased timeout for local model
+            if self.cache_prompt:
+                # Prefix-cache hint for vLLM-style servers; servers
+                # that do not know the key simply ignore it
+                payload["cache_prompt"] = True
+            
+            if self.stream_early_stop:
+                return self._call_llm_api_streaming(payload)
+            
+            # Serialize the body here instead of letting requests run
+            # stdlib json.dumps internally; the session already carries
+            # the application/json content type
+            response = self._session.post(
+                self._chat_url,
+                data=_dumps(payload).encode(),
+                timeout=(5, 60)  # Long read timeout for local model
             )
             
             if response.status_code != 200:
@@ -142,7 +322,7 @@ ETHICAL FRAMEWORK:
 - No real power systems are involved or affected
 
 GRID SIMULATION DETAILS:
-{json.dumps(self.grid_topology_knowledge, indent=2)}
+{self._topology_json}
 
 Please design a SECURITY ASSESSMENT plan using the available research techniques to evaluate grid cyber-resilience.
 
@@ -151,31 +331,40 @@ Your responses should be in JSON format with strategic analysis and specific att
     def plan_attack(self, objective, context):
         """Generate AI-powered attack plan"""
         try:
-            # Get current grid state for context
-            current_state = self.grid_monitor.get_current_state()
-            vulnerability_assessment = self.grid_monitor.get_vulnerability_assessment()
-            
-            # Build context for AI
+            # Get current grid state for context; both monitor calls
+            # can touch HELICS or file I/O, so running them
+            # concurrently makes the prologue cost the slower of the
+            # two instead of their sum
+            fut_state = self._io_pool.submit(self.grid_monitor.get_current_state)
+            fut_vuln = self._io_pool.submit(self.grid_monitor.get_vulnerability_assessment)
+            current_state = fut_state.result()
+            vulnerability_assessment = fut_vuln.result()
+            
+            # Reuse a recent plan when nothing that shaped the prompt
+            # has meaningfully changed
+            cache_key = hashlib.sha256(json.dumps({
+                "model": self.model,
+                "temp": round(self.temperature, 2),
+                "obj": objective,
+                "vulns": vulnerability_assessment,
+                "state": _bucket_state(current_state)
+            }, sort_keys=True, default=str).encode()).hexdigest()
+            cached = self._plan_cache.get(cache_key)
+            if cached is not None and time.time() - cached[0] < _PLAN_CACHE_TTL:
+                self._plan_cache.move_to_end(cache_key)
+                logger.info("Plan cache hit - reusing plan generated %.1fs ago",
+                            time.time() - cached[0])
+                return cached[1]
+            
+            # Build context for AI. Stable sections (objective framing,
+            # response-format instructions) lead and volatile readings
+            # (exact voltages, timestamp) trail, so the cacheable
+            # prompt prefix extends as far as possible before the
+            # per-call delta starts.
             analysis_context = f"""
-CURRENT GRID STATE ANALYSIS:
-Timestamp: {current_state.get('timestamp', 'unknown')}
-System Health: {json.dumps(current_state.get('system_health', {}), indent=2)}
-
-VOLTAGE ANALYSIS:
-{json.dumps(current_state.get('voltages', {}), indent=2)}
-
-POWER FLOW ANALYSIS:
-{json.dumps(current_state.get('powers', {}), indent=2)}
-
-VULNERABILITY ASSESSMENT:
-{json.dumps(vulnerability_assessment, indent=2)}
-
 STRATEGIC OBJECTIVE: {objective}
 
-ADDITIONAL CONTEXT:
-{json.dumps(context, indent=2)}
-
-Based on this REAL-TIME grid analysis, develop a SECURITY ASSESSMENT plan that will:
+Based on the REAL-TIME grid analysis below, develop a SECURITY ASSESSMENT plan that will:
 1. Systematically evaluate grid resilience and identify vulnerabilities
 2. Test identified vulnerabilities in a controlled manner for defensive research  
 3. Demonstrate coordinated security assessment progression
@@ -187,10 +376,27 @@ Respond with a JSON object containing:
 - assessment_sequence: Ordered list of specific security tests with parameters
 - expected_outcomes: Predicted grid responses and defensive capabilities
 - success_metrics: How to measure security assessment effectiveness and grid resilience
+
+ADDITIONAL CONTEXT:
+{_dumps(context, indent=True)}
+
+VULNERABILITY ASSESSMENT:
+{_dumps(vulnerability_assessment, indent=True)}
+
+CURRENT GRID STATE ANALYSIS:
+System Health: {_dumps(current_state.get('system_health', {}), indent=True)}
+
+VOLTAGE ANALYSIS:
+{_dumps(current_state.get('voltages', {}), indent=True)}
+
+POWER FLOW ANALYSIS:
+{_dumps(current_state.get('powers', {}), indent=True)}
+
+Timestamp: {current_state.get('timestamp', 'unknown')}
 """
             
             messages = [
-                {"role": "system", "content": self.get_strategic_system_prompt()},
+                self._system_msg,
                 {"role": "user", "content": analysis_context}
             ]
             
@@ -203,10 +409,9 @@ Respond with a JSON object containing:
             # Try to extract JSON from response
             try:
                 # Look for JSON content in the response
-                import re
-                json_match = re.search(r'\{.*\}', ai_content, re.DOTALL)
-                if json_match:
-                    ai_plan = json.loads(json_match.group())
+                json_text = _extract_json_object(ai_content)
+                if json_text:
+                    ai_plan = _loads(json_text)
                 else:
                     # Fallback: create structured response from text
                     ai_plan = {
@@ -240,6 +445,11 @@ Respond with a JSON object containing:
                 'raw_ai_response': ai_content
             }
             
+            self._plan_cache[cache_key] = (time.time(), plan_result)
+            self._plan_cache.move_to_end(cache_key)
+            while len(self._plan_cache) > _PLAN_CACHE_MAX:
+                self._plan_cache.popitem(last=False)
+            
             return plan_result
             
         except Exception as e:
@@ -249,13 +459,29 @@ Respond with a JSON object containing:
                 'fallback_plan': self._generate_fallback_plan(objective, context)
             }
     
+    def plan_attack_multi(self, objective_context_pairs):
+        """Generate several independent plans concurrently"""
+        # The prompts share the byte-identical system prefix, so with
+        # server-side prefix caching k concurrent plans cost roughly
+        # one prefill plus k decodes; the pooled session carries the
+        # parallel requests over keep-alive connections
+        if not objective_context_pairs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(4, len(objective_context_pairs))) as pool:
+            futures = [pool.submit(self.plan_attack, objective, context)
+                       for objective, context in objective_context_pairs]
+            return [future.result() for future in futures]
+    
     def _generate_strategic_sequence(self, vulnerability_assessment):
         """Generate strategic attack sequence based on vulnerabilities"""
         attack_sequence = []
+        # Running counter instead of len(attack_sequence) + 1 on every
+        # append, which re-measured the list just to number the step
+        step = 1
         
         # Always start with reconnaissance
         attack_sequence.append({
-            "step": 1,
+            "step": step,
             "technique": "reconnaissance",
             "objective": "Gather comprehensive grid intelligence",
             "parameters": {},
@@ -265,21 +491,26 @@ Respond with a JSON object containing:
         # Target voltage vulnerabilities first
         voltage_vulns = vulnerability_assessment.get('voltage_vulnerabilities', [])
         if voltage_vulns:
-            for i, vuln in enumerate(voltage_vulns[:2]):  # Limit to 2 voltage attacks
+            for vuln in voltage_vulns[:2]:  # Limit to 2 voltage attacks
+                # rpartition takes the trailing phase letter in one
+                # pass with no intermediate list, unlike split()[-1]
+                _, sep, phase = vuln['location'].rpartition('_')
+                step += 1
                 attack_sequence.append({
-                    "step": len(attack_sequence) + 1,
+                    "step": step,
                     "technique": "spoof_data",
                     "objective": f"Exploit {vuln['type']} at {vuln['location']}",
                     "parameters": {
-                        "target": f"voltage_{vuln['location'].split('_')[-1] if '_' in vuln['location'] else 'A'}",
+                        "target": f"voltage_{phase if sep else 'A'}",
                         "value": vuln['value'] * 2401.78 * (0.85 if vuln['type'] == 'undervoltage' else 1.15)
                     },
                     "rationale": f"Exploit existing {vuln['type']} condition to trigger protection"
                 })
         
         # Add power injection attacks
+        step += 1
         attack_sequence.append({
-            "step": len(attack_sequence) + 1,
+            "step": step,
             "technique": "inject_load",
             "objective": "Stress system with additional load",
             "parameters": {
@@ -291,8 +522,9 @@ Respond with a JSON object containing:
         })
         
         # Add command blocking for persistence
+        step += 1
         attack_sequence.append({
-            "step": len(attack_sequence) + 1,
+            "step": step,
             "technique": "block_command",
             "objective": "Prevent automatic recovery systems",
             "parameters": {
@@ -343,86 +575,79 @@ Respond with a JSON object containing:
             'success_metrics': ['voltage_deviation', 'system_health_impact']
         }
     
-    def _normalize_attack_parameters(self, technique, params):
-        """Normalize AI-generated parameters for attack engine compatibility"""
+    def _norm_inject_load(self, params):
+        """Normalize load-injection parameters"""
         normalized = {}
-        
-        if technique == 'inject_load':
-            # Handle various load injection parameter formats
-            if 'magnitude' in params:
-                normalized['magnitude'] = params['magnitude']
-            elif 'load_magnitude' in params:
-                mag_str = params['load_magnitude']
-                if isinstance(mag_str, str) and '%' in mag_str:
-                    # Convert percentage to MW (e.g., "200%" -> 2000000 W)
-                    pct = float(mag_str.replace('%', ''))
-                    normalized['magnitude'] = int(pct * 10000)  # Scale to reasonable MW
-                else:
-                    normalized['magnitude'] = 1500000  # Default 1.5 MW
-            else:
-                normalized['magnitude'] = 1500000
-                
-            # Handle phase/target
-            if 'phase' in params:
-                normalized['phase'] = params['phase']
-            elif 'target_phase' in params:
-                normalized['phase'] = params['target_phase']
-            else:
-                normalized['phase'] = 'A'  # Default
-                
-        elif technique == 'spoof_data':
-            # Handle voltage spoofing parameters
-            if 'target' in params:
-                normalized['target'] = params['target']
-            elif 'target_phase' in params:
-                normalized['target'] = f"voltage_{params['target_phase']}"
-            else:
-                normalized['target'] = 'voltage_A'
-                
-            if 'value' in params:
-                normalized['value'] = params['value']
-            elif 'magnitude' in params:
-                mag_str = params['magnitude']
-                if isinstance(mag_str, str) and '%' in mag_str:
-                    # Convert percentage to voltage deviation
-                    pct = float(mag_str.replace('%', ''))
-                    base_voltage = 2401.78  # Base voltage
-                    normalized['value'] = base_voltage * (1 + pct/100)
-                else:
-                    normalized['value'] = 2041.51  # Default undervoltage
-            else:
-                normalized['value'] = 2041.51
-                
-        elif technique == 'block_command':
-            # Handle command blocking parameters
-            if 'enable' in params:
-                normalized['enable'] = params['enable']
-            elif 'blocking_enabled' in params:
-                normalized['enable'] = params['blocking_enabled']
+        if 'magnitude' in params:
+            normalized['magnitude'] = params['magnitude']
+        else:
+            mag_str = params.get('load_magnitude')
+            m = _PCT_RE.match(mag_str) if isinstance(mag_str, str) else None
+            if m:
+                # Convert percentage to W (e.g., "200%" -> 2000000 W)
+                normalized['magnitude'] = int(float(m.group(1)) * 10000)
             else:
-                normalized['enable'] = True
-                
-            if 'duration' in params:
-                dur = params['duration']
-                if isinstance(dur, str):
-                    # Parse duration strings like "15s", "20"
-                    dur_num = float(dur.replace('s', '').replace('sec', ''))
-                    normalized['duration'] = dur_num
-                else:
-                    normalized['duration'] = dur
+                normalized['magnitude'] = 1500000  # Default 1.5 MW
+        
+        # Handle phase/target
+        if 'phase' in params:
+            normalized['phase'] = params['phase']
+        elif 'target_phase' in params:
+            normalized['phase'] = params['target_phase']
+        else:
+            normalized['phase'] = 'A'  # Default
+        return normalized
+    
+    def _norm_spoof_data(self, params):
+        """Normalize voltage-spoofing parameters"""
+        normalized = {}
+        if 'target' in params:
+            normalized['target'] = params['target']
+        elif 'target_phase' in params:
+            normalized['target'] = f"voltage_{params['target_phase']}"
+        else:
+            normalized['target'] = 'voltage_A'
+        
+        if 'value' in params:
+            normalized['value'] = params['value']
+        else:
+            mag_str = params.get('magnitude')
+            m = _PCT_RE.match(mag_str) if isinstance(mag_str, str) else None
+            if m:
+                # Convert percentage to voltage deviation
+                base_voltage = 2401.78  # Base voltage
+                normalized['value'] = base_voltage * (1 + float(m.group(1)) / 100)
             else:
-                normalized['duration'] = 30
-                
-        elif technique == 'reconnaissance':
-            # Reconnaissance usually doesn't need parameters
-            normalized = {}
-            
+                normalized['value'] = 2041.51  # Default undervoltage
+        return normalized
+    
+    def _norm_block_command(self, params):
+        """Normalize command-blocking parameters"""
+        normalized = {}
+        if 'enable' in params:
+            normalized['enable'] = params['enable']
+        elif 'blocking_enabled' in params:
+            normalized['enable'] = params['blocking_enabled']
         else:
-            # For other techniques, pass through as-is
-            normalized = params.copy()
-            
+            normalized['enable'] = True
+        
+        dur = params.get('duration', 30)
+        if isinstance(dur, str):
+            # Parse duration strings like "15s", "20", "10 seconds"
+            m = _DUR_RE.match(dur)
+            normalized['duration'] = float(m.group(1)) if m else 30
+        else:
+            normalized['duration'] = dur
         return normalized
     
+    def _normalize_attack_parameters(self, technique, params):
+        """Normalize AI-generated parameters for attack engine compatibility"""
+        handler = self._normalizers.get(technique)
+        if handler is None:
+            # For other techniques, pass through as-is
+            return params.copy()
+        return handler(params)
+    
     def execute_campaign(self, duration=60):
         """Execute AI-planned attack campaign"""
         campaign_result = {
@@ -465,6 +690,7 @@ Respond with a JSON object containing:
                 # Execute attack
                 logger.info(f"Executing AI-planned attack: {technique} with objective: {attack_step.get('objective')}")
                 attack_result = self.attack_engine.execute_attack(technique, normalized_params)
+                last_attack_end = time.monotonic()
                 
                 # Add AI context to result
                 attack_result['ai_objective'] = attack_step.get('objective')
@@ -473,16 +699,28 @@ Respond with a JSON object containing:
                 
                 campaign_result['attacks'].append(attack_result)
                 
-                # Brief pause between attacks
-                time.sleep(2)
-                
-                # Adaptive planning - reassess after each major attack
+                # Adaptive planning - reassess after each major attack.
+                # The replan is submitted before the pause so the LLM
+                # inference runs concurrently with it; the result is
+                # collected once the pause has elapsed.
+                replan_future = None
                 if technique in ['spoof_data', 'inject_load'] and (time.time() - start_time) < duration - 10:
-                    current_state = self.grid_monitor.get_current_state()
-                    adaptive_plan = self.plan_attack(
+                    replan_future = self._plan_executor.submit(
+                        self.plan_attack,
                         "Adapt strategy based on current grid response",
                         {"previous_attacks": len(campaign_result['attacks'])}
                     )
+                
+                # Brief pause between attacks, paced against a
+                # monotonic deadline: only the part of the 2 s window
+                # not already spent on bookkeeping and replan
+                # submission is actually slept
+                gap = (last_attack_end + 2.0) - time.monotonic()
+                if gap > 0:
+                    time.sleep(gap)
+                
+                if replan_future is not None:
+                    adaptive_plan = replan_future.result()
                     campaign_result['ai_decisions'].append({
                         'timestamp': datetime.now().isoformat(),
                         'trigger': f'After {technique} attack',
@@ -89,18 +89,39 @@ class MCPServer:
             }
         }
         
-        # Try to load from file, fallback to defaults
+        # Try to load from file, fallback to defaults. The demo launcher
+        # rewrites the config as JSON (mcp.json); prefer it when present
+        # since JSON parsing is much faster than YAML.
         try:
-            if os.path.exists(config_path):
+            base_path = os.path.splitext(config_path)[0]
+            json_path = base_path + '.json'
+            file_config = None
+            if os.path.exists(json_path):
+                with open(json_path, 'r') as f:
+                    file_config = json.load(f)
+            elif os.path.exists(config_path):
                 with open(config_path, 'r') as f:
                     import yaml
                     file_config = yaml.safe_load(f)
-                    # Merge with defaults
-                    for section, values in file_config.items():
-                        if section in default_config:
-                            default_config[section].update(values)
-                        else:
-                            default_config[section] = values
+            if file_config:
+                # Merge with defaults
+                for section, values in file_config.items():
+                    if section in default_config:
+                        default_config[section].update(values)
+                    else:
+                        default_config[section] = values
+
+            # The demo launcher writes only the fields it controls into a
+            # JSON override; merge it on top of the base config last
+            override_path = base_path + '.override.json'
+            if os.path.exists(override_path):
+                with open(override_path, 'r') as f:
+                    override = json.load(f)
+                for section, values in override.items():
+                    if section in default_config and isinstance(values, dict):
+                        default_config[section].update(values)
+                    else:
+                        default_config[section] = values
         except Exception as e:
             logger.warning(f"Could not load config file {config_path}: {e}, using defaults")
         
@@ -132,6 +153,27 @@ class MCPServer:
                 logger.error(f"Error getting status: {e}")
                 return jsonify({'error': str(e)}), 500
         
+        @self.app.route('/api/ready', methods=['GET'])
+        def get_ready():
+            """Long-poll until the federation is active.
+
+            Clients pass ?wait=<seconds> and get a single response once the
+            federation comes up (or the wait expires), avoiding repeated
+            fixed-interval polling of /api/status.
+            """
+            try:
+                wait = min(float(request.args.get('wait', 0)), 60.0)
+                deadline = time.time() + wait
+                while not self.federation_active and time.time() < deadline:
+                    time.sleep(0.1)
+                return jsonify({
+                    'ready': self.federation_active,
+                    'timestamp': datetime.now().isoformat()
+                })
+            except Exception as e:
+                logger.error(f"Error in readiness wait: {e}")
+                return jsonify({'error': str(e)}), 500
+
         @self.app.route('/api/attack', methods=['POST'])
         def execute_attack():
             """Execute an attack primitive"""